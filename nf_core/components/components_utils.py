@@ -1,10 +1,12 @@
 import logging
 import re
+from bisect import bisect_left
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 import questionary
 import rich.prompt
+from prompt_toolkit.completion import Completer, Completion
 
 import nf_core.utils
 from nf_core.modules.modules_repo import ModulesRepo
@@ -12,6 +14,25 @@ from nf_core.modules.modules_repo import ModulesRepo
 log = logging.getLogger(__name__)
 
 
+class PrefixCompleter(Completer):
+    """Prompt-toolkit completer using prefix lookup on a sorted list of choices.
+
+    The default autocomplete completer scans every choice on each keystroke, which
+    causes visible input latency for repositories with thousands of components.
+    Bisecting the sorted list finds the range of matching choices directly.
+    """
+
+    def __init__(self, choices: List[str]):
+        self.choices = sorted(choices)
+
+    def get_completions(self, document, complete_event):
+        prefix = document.text_before_cursor
+        start = bisect_left(self.choices, prefix)
+        end = bisect_left(self.choices, prefix + "\uffff")
+        for choice in self.choices[start:end]:
+            yield Completion(choice, start_position=-len(prefix))
+
+
 def get_repo_info(directory: str, use_prompt: Optional[bool] = True) -> Tuple[str, Optional[str], str]:
     """
     Determine whether this is a pipeline repository or a clone of
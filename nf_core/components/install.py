@@ -20,10 +20,12 @@ log = logging.getLogger(__name__)
 
 
 class ComponentInstall(ComponentCommand):
+    # Overridden by type-specific subclasses, so they don't need a pass-through __init__
+    component_type: str = ""
+
     def __init__(
         self,
         pipeline_dir,
-        component_type,
         force=False,
         prompt=False,
         sha=None,
@@ -31,7 +33,11 @@ class ComponentInstall(ComponentCommand):
         branch=None,
         no_pull=False,
         installed_by=False,
+        *,
+        component_type=None,
     ):
+        if component_type is None:
+            component_type = self.component_type
         super().__init__(component_type, pipeline_dir, remote_url, branch, no_pull)
         self.force = force
         self.prompt = prompt
@@ -8,6 +8,7 @@ from rich.syntax import Syntax
 
 import nf_core.utils
 from nf_core.components.components_command import ComponentCommand
+from nf_core.components.components_utils import PrefixCompleter
 from nf_core.modules.modules_json import ModulesJson
 
 from .install import ComponentInstall
@@ -19,7 +20,9 @@ class ComponentRemove(ComponentCommand):
     def __init__(self, component_type, pipeline_dir, remote_url=None, branch=None, no_pull=False):
         super().__init__(component_type, pipeline_dir, remote_url, branch, no_pull)
 
-    def remove(self, component, removed_by=None, removed_components=None, force=False):
+    def remove(
+        self, component, removed_by=None, removed_components=None, force=False, modules_json=None, write_file=True
+    ):
         """
         Remove an already installed module/subworkflow
         This command only works for modules/subworkflows that are installed from 'nf-core/modules'
@@ -30,6 +33,8 @@ class ComponentRemove(ComponentCommand):
                 (a subworkflow name if the component is a dependency or "modules" or "subworkflows" if it is not a dependency)
             removed_components (list[str]): list of components that have been removed during a recursive remove of subworkflows
             force (bool): Force removal of component, even if there is still an include statement in a workflow file
+            modules_json (ModulesJson): ModulesJson object to reuse when removing dependencies recursively
+            write_file (bool): whether to write the updated modules.json to disk, or leave it to the caller
 
         Returns:
             bool: True if any item has been removed, False if not
@@ -48,9 +53,11 @@ class ComponentRemove(ComponentCommand):
 
         repo_path = self.modules_repo.repo_path
         if component is None:
+            choices = sorted(self.components_from_repo(repo_path))
             component = questionary.autocomplete(
                 f"{self.component_type[:-1]} name:",
-                choices=self.components_from_repo(repo_path),
+                choices=choices,
+                completer=PrefixCompleter(choices),
                 style=nf_core.utils.nfcore_question_style,
             ).unsafe_ask()
 
@@ -60,19 +67,23 @@ class ComponentRemove(ComponentCommand):
         # Get the module/subworkflow directory
         component_dir = Path(self.dir, self.component_type, repo_path, component)
 
-        # Load the modules.json file
-        modules_json = ModulesJson(self.dir)
-        modules_json.load()
+        if modules_json is None:
+            modules_json = ModulesJson(self.dir)
 
-        # Verify that the module/subworkflow is actually installed
+        # Verify that the module/subworkflow is actually installed before parsing modules.json
         if not component_dir.exists():
             log.error(f"Installation directory '{component_dir}' does not exist.")
 
+            # module_present loads modules.json on demand to probe for a stray entry
             if modules_json.module_present(component, self.modules_repo.remote_url, repo_path):
                 log.error(f"Found entry for '{component}' in 'modules.json'. Removing...")
                 modules_json.remove_entry(self.component_type, component, self.modules_repo.remote_url, repo_path)
             return False
 
+        # Load the modules.json file, unless we were given an already-loaded one to reuse
+        if modules_json.modules_json is None:
+            modules_json.load()
+
         # remove all dependent components based on installed_by entry
         # Remove entry from modules.json
         removed = False
@@ -84,6 +95,7 @@ class ComponentRemove(ComponentCommand):
             self.modules_repo.remote_url,
             repo_path,
             removed_by=removed_by,
+            write_file=write_file,
         )
         removed_component_dir = Path(self.component_type, repo_path, component)
         if removed_component:
@@ -123,12 +135,16 @@ class ComponentRemove(ComponentCommand):
                         style=nf_core.utils.nfcore_question_style,
                     ).unsafe_ask():
                         # add the component back to modules.json
-                        if not ComponentInstall(self.dir, self.component_type, force=True).install(
+                        # write any batched modules.json changes first so the installer sees them,
+                        # and reload afterwards to pick up the reinstalled entry
+                        modules_json.dump()
+                        if not ComponentInstall(self.dir, component_type=self.component_type, force=True).install(
                             component, silent=True
                         ):
                             log.warning(
                                 f"Could not install the {self.component_type[:-1]} '{component}', please install it manually with 'nf-core {self.component_type} install  {component}'."
                             )
+                        modules_json.load()
                         removed_components.append(component)
                         return removed
             # Remove the component files of all entries removed from modules.json
@@ -143,18 +159,29 @@ class ComponentRemove(ComponentCommand):
                 dependent_components = modules_json.get_dependent_components(
                     self.component_type, component, self.modules_repo.remote_url, repo_path, {}
                 )
-                for component_name, component_type in dependent_components.items():
+                # Remove the deepest components first and batch the modules.json updates
+                # into a single write instead of one re-read + re-write per dependency
+                for component_name, component_type in sorted(
+                    dependent_components.items(), key=lambda dep: dep[0].count("/"), reverse=True
+                ):
                     if component_name in removed_components:
                         continue
                     original_component_type = self.component_type
                     self.component_type = component_type
                     dependency_removed = self.remove(
-                        component_name, removed_by=removed_by, removed_components=removed_components
+                        component_name,
+                        removed_by=removed_by,
+                        removed_components=removed_components,
+                        modules_json=modules_json,
+                        write_file=False,
                     )
                     self.component_type = original_component_type
                     # remember removed dependencies
                     if dependency_removed:
                         removed_components.append(component_name.replace("/", "_"))
+                # only the outermost call flushes the batched changes to disk
+                if write_file:
+                    modules_json.dump()
             # print removed dependencies
             if removed_components:
                 log.info(f"Removed files for '{component}' and its dependencies '{', '.join(removed_components)}'.")
@@ -922,12 +922,12 @@ class ComponentUpdate(ComponentCommand):
             for module in included_modules:
                 if module not in modules_to_update:
                     log.info(f"Installing newly included module '{module}' for '{component}'")
-                    install_module_object = ComponentInstall(self.dir, "modules", installed_by=component)
+                    install_module_object = ComponentInstall(self.dir, component_type="modules", installed_by=component)
                     install_module_object.install(module, silent=True)
             for subworkflow in included_subworkflows:
                 if subworkflow not in subworkflows_to_update:
                     log.info(f"Installing newly included subworkflow '{subworkflow}' for '{component}'")
-                    install_subworkflow_object = ComponentInstall(self.dir, "subworkflows", installed_by=component)
+                    install_subworkflow_object = ComponentInstall(self.dir, component_type="subworkflows", installed_by=component)
                     install_subworkflow_object.install(subworkflow, silent=True)
 
     def _change_component_type(self, new_component_type):
@@ -485,7 +485,7 @@ class PipelineLint(nf_core.utils.Pipeline):
         with open(json_fn, "w") as fh:
             json.dump(results, fh, indent=4)
 
-    def _wrap_quotes(self, files: Union[List[str], List[Path], Path]) -> str:
+    def _wrap_quotes(self, files: Union[List[str], List[Path], Tuple[Path, ...], Path]) -> str:
         """Helper function to take a list of filenames and format with markdown.
 
         Args:
@@ -498,7 +498,7 @@ class PipelineLint(nf_core.utils.Pipeline):
 
                 `foo` or bar` or `baz`
         """
-        if not isinstance(files, list):
+        if not isinstance(files, (list, tuple)):
             files = [files]
         bfiles = [f"`{str(f)}`" for f in files]
         return " or ".join(bfiles)
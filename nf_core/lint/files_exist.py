@@ -246,17 +246,19 @@ def files_exist(self) -> Dict[str, Union[List[str], bool]]:
         if str(file_cond[0]) in ignore_files:
             continue
         in_config = False
-        config_key, config_value = list(file_cond[1].items())[0]
+        config_key, config_value = next(iter(file_cond[1].items()))
         if config_key in self.nf_config and config_value in self.nf_config[config_key]:
             log.debug(f"Found {config_key} in nextflow.config with value {config_value}")
             in_config = True
-        if pf(file_cond[0]).is_file() and in_config:
+        # Stat the file once and branch on the result
+        file_exists = pf(file_cond[0]).is_file()
+        if file_exists and in_config:
             failed.append(f"File must be removed: {self._wrap_quotes(file_cond[0])}")
-        elif pf(file_cond[0]).is_file() and not in_config:
+        elif file_exists and not in_config:
             passed.append(f"File found check: {self._wrap_quotes(file_cond[0])}")
-        elif not pf(file_cond[0]).is_file() and not in_config:
+        elif not file_exists and not in_config:
             failed.append(f"File not found check: {self._wrap_quotes(file_cond[0])}")
-        elif not pf(file_cond[0]).is_file() and in_config:
+        elif not file_exists and in_config:
             passed.append(f"File not found check: {self._wrap_quotes(file_cond[0])}")
     # Files that cause a warning if they exist
     for file in files_warn_ifexists:
@@ -701,7 +701,7 @@ class ModulesJson:
             self.dump()
         return True
 
-    def remove_entry(self, component_type, name, repo_url, install_dir, removed_by=None):
+    def remove_entry(self, component_type, name, repo_url, install_dir, removed_by=None, write_file=True):
         """
         Removes an entry from the 'modules.json' file.
 
@@ -711,6 +711,7 @@ class ModulesJson:
             repo_url (str): URL of the repository containing the component
             install_dir (str): Name of the directory where components are installed
             removed_by (str): Name of the component that wants to remove the component
+            write_file (bool): whether to write the updated modules.json to a file.
         Returns:
             (bool): return True if the component was removed, False if it was not found or is still depended on
         """
@@ -734,9 +735,11 @@ class ModulesJson:
                             if len(repo_entry) == 0:
                                 self.modules_json["repos"].pop(repo_url)
                         # write the updated modules.json file
-                        self.dump()
+                        if write_file:
+                            self.dump()
                         return True
-                    self.dump()
+                    if write_file:
+                        self.dump()
                     return False
             else:
                 log.warning(
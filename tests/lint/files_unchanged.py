@@ -1,4 +1,5 @@
 from pathlib import Path
+from unittest import mock
 
 import nf_core.lint
 
@@ -12,6 +13,27 @@ def test_files_unchanged_pass(self):
     assert not results.get("could_fix", True)
 
 
+def test_files_unchanged_cached_result(self):
+    new_pipeline = self._make_pipeline_copy()
+    lint_obj = nf_core.lint.PipelineLint(new_pipeline)
+    lint_obj._load()
+    results = lint_obj.files_unchanged()
+
+    # An untouched pipeline serves the stored result without comparing any files
+    with mock.patch("nf_core.lint.files_unchanged._file_digest") as mock_digest:
+        cached_results = lint_obj.files_unchanged()
+    mock_digest.assert_not_called()
+    assert cached_results == results
+
+    # Editing a file invalidates the stored fingerprint and the check runs again
+    failing_file = Path(".github", "CONTRIBUTING.md")
+    with open(Path(new_pipeline, failing_file), "a") as fh:
+        fh.write("THIS SHOULD NOT BE HERE")
+    results = lint_obj.files_unchanged()
+    assert len(results["failed"]) > 0
+    assert str(failing_file) in results["failed"][0]
+
+
 def test_files_unchanged_fail(self):
     failing_file = Path(".github", "CONTRIBUTING.md")
     new_pipeline = self._make_pipeline_copy()
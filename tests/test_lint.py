@@ -214,6 +214,7 @@ class TestLint(unittest.TestCase):
         test_files_exist_pass_conditional,
     )
     from .lint.files_unchanged import (  # type: ignore[misc]
+        test_files_unchanged_cached_result,
         test_files_unchanged_fail,
         test_files_unchanged_pass,
     )